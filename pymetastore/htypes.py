@@ -4,9 +4,11 @@ User defined types are defined by the user, using a combination of complex
 and primitive types and thus are not included in this module.
 there are also some helper functions to convert between Hive metastore types and HType objects.
 """
+import re
+import sys
 from collections import namedtuple
 from enum import Enum
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 class PrimitiveCategory(Enum):
@@ -52,6 +54,8 @@ class HType:
     It contains the name of the type and the category of the type.
     """
 
+    __slots__ = ("name", "category")
+
     def __init__(self, name: str, category: HTypeCategory):
         self.name = name
         self.category = category
@@ -72,12 +76,34 @@ class HPrimitiveType(HType):
     """
     A class representing a primitive type in Hive metastore.
     It is initialized by passing a PrimitiveCategory enum value.
+    There is a single instance per PrimitiveCategory, so constructing one
+    returns the shared instance instead of allocating a new object.
     """
 
+    __slots__ = ("primitive_type",)
+
+    _instances: Dict[Tuple[type, PrimitiveCategory], "HPrimitiveType"] = {}
+
+    def __new__(cls, primitive_type: PrimitiveCategory):
+        key = (cls, primitive_type)
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = cls._instances.setdefault(key, super().__new__(cls))
+        return instance
+
     def __init__(self, primitive_type: PrimitiveCategory):
+        # __init__ runs on every construction, the shared instance only needs
+        # to be initialized the first time.
+        if getattr(self, "primitive_type", None) is not None:
+            return
         super().__init__(primitive_type.value, HTypeCategory.PRIMITIVE)
         self.primitive_type = primitive_type
 
+    def __reduce__(self):
+        # Route copies and unpickling through __new__ so they resolve to the
+        # shared instance.
+        return (self.__class__, (self.primitive_type,))
+
     def __str__(self):
         return f"{self.__class__.__name__}(name={self.name}, category={self.category})"
 
@@ -85,12 +111,19 @@ class HPrimitiveType(HType):
         return f"{self.__class__.__name__}({self.primitive_type})"
 
 
+# Create the shared instances upfront.
+for _primitive_type in PrimitiveCategory:
+    HPrimitiveType(_primitive_type)
+
+
 class HMapType(HType):
     """
     A class representing a map type in Hive metastore.
     It is initialized by passing two lists. A list of field names and a list of field types.
     """
 
+    __slots__ = ("key_type", "value_type")
+
     def __init__(self, key_type: HType, value_type: HType):
         super().__init__("MAP", HTypeCategory.MAP)
         self.key_type = key_type
@@ -100,7 +133,7 @@ class HMapType(HType):
         return f"{super().__str__()}, key_type={str(self.key_type)}, value_type={str(self.value_type)})"
 
     def __repr__(self):
-        return f"HMapType({repr(self.key_type)}, {repr(self.value_type)})"
+        return f"HMapType({self.key_type!r}, {self.value_type!r})"
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
@@ -118,6 +151,8 @@ class HListType(HType):
     It is initialized by passing the element type of the list.
     """
 
+    __slots__ = ("element_type",)
+
     def __init__(self, element_type: HType):
         super().__init__("LIST", HTypeCategory.LIST)
         self.element_type = element_type
@@ -126,7 +161,7 @@ class HListType(HType):
         return f"{super().__str__()}, element_type={str(self.element_type)})"
 
     def __repr__(self):
-        return f"HListType({repr(self.element_type)})"
+        return f"HListType({self.element_type!r})"
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
@@ -140,6 +175,8 @@ class HUnionType(HType):
     It is initialized by passing a list of types.
     """
 
+    __slots__ = ("types",)
+
     def __init__(self, types: List[HType]):
         super().__init__("UNION", HTypeCategory.UNION)
         self.types = types
@@ -148,7 +185,7 @@ class HUnionType(HType):
         return f"{super().__str__()}, types={str(self.types)})"
 
     def __repr__(self):
-        return f"HUnionType({repr(self.types)})"
+        return f"HUnionType({self.types!r})"
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
@@ -163,10 +200,13 @@ class HVarcharType(HType):
     Varchar by definition has a maximum length of 65535.
     """
 
+    __slots__ = ("length",)
+
+    MAX_LENGTH = 65535
+
     def __init__(self, length: int):
-        MAX_VARCHAR_LENGTH = 65535
-        if length > MAX_VARCHAR_LENGTH:
-            raise ValueError("Varchar length cannot exceed 65535")
+        if length > HVarcharType.MAX_LENGTH:
+            raise ValueError(f"Varchar length cannot exceed {HVarcharType.MAX_LENGTH}")
         super().__init__("VARCHAR", HTypeCategory.PRIMITIVE)
         self.length = length
 
@@ -189,10 +229,13 @@ class HCharType(HType):
     Char by definition has a maximum length of 255.
     """
 
+    __slots__ = ("length",)
+
+    MAX_LENGTH = 255
+
     def __init__(self, length: int):
-        MAX_CHAR_LENGTH = 255
-        if length > MAX_CHAR_LENGTH:
-            raise ValueError("Char length cannot exceed 255")
+        if length > HCharType.MAX_LENGTH:
+            raise ValueError(f"Char length cannot exceed {HCharType.MAX_LENGTH}")
         super().__init__("CHAR", HTypeCategory.PRIMITIVE)
         self.length = length
 
@@ -215,13 +258,18 @@ class HDecimalType(HType):
     Decimal by definition has a maximum precision and scale of 38.
     """
 
+    __slots__ = ("precision", "scale")
+
+    MAX_PRECISION = 38
+    MAX_SCALE = 38
+
     def __init__(self, precision: int, scale: int):
-        MAX_PRECISION = 38
-        MAX_SCALE = 38
-        if precision > MAX_PRECISION:
-            raise ValueError("Decimal precision cannot exceed 38")
-        if scale > MAX_SCALE:
-            raise ValueError("Decimal scale cannot exceed 38")
+        if precision > HDecimalType.MAX_PRECISION:
+            raise ValueError(
+                f"Decimal precision cannot exceed {HDecimalType.MAX_PRECISION}"
+            )
+        if scale > HDecimalType.MAX_SCALE:
+            raise ValueError(f"Decimal scale cannot exceed {HDecimalType.MAX_SCALE}")
         super().__init__("DECIMAL", HTypeCategory.PRIMITIVE)
         self.precision = precision
         self.scale = scale
@@ -248,6 +296,8 @@ class HStructType(HType):
     Struct is parameterized by a list of names and types.
     """
 
+    __slots__ = ("names", "types")
+
     def __init__(self, names: List[str], types: List[HType]):
         if len(names) != len(types):
             raise ValueError("mismatched size of names and types.")
@@ -264,7 +314,7 @@ class HStructType(HType):
         return f"{super().__str__()}, names={self.names}, types={self.types})"
 
     def __repr__(self):
-        return f"HStructType({self.names}, {self.types})"
+        return f"HStructType({self.names!r}, {self.types!r})"
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
@@ -357,10 +407,18 @@ def serde_to_primitive(serde_type_name: str) -> Optional[PrimitiveCategory]:
 
 
 def get_serde_type_by_value(value):
-    for member in SerdeTypeNameConstants:
-        if member.value == value:
-            return member.name
-    return None
+    return _SERDE_NAMES_BY_VALUE.get(value)
+
+
+_SERDE_NAMES_BY_VALUE = {member.value: member.name for member in SerdeTypeNameConstants}
+
+# Type keywords, as they appear in the Thrift type string, mapped to the
+# primitive category they parse to. Keys are lowercase.
+_PRIMITIVE_KEYWORDS = {
+    serde.value: primitive
+    for primitive, serde in primitive_to_serde_mapping.items()
+    if primitive is not PrimitiveCategory.UNKNOWN
+}
 
 
 """
@@ -370,6 +428,9 @@ string to get the type name and the type parameters.
 
 
 class Token(namedtuple("Token", ["position", "text", "type"])):
+    # Tokens are created in bulk, don't give each one a __dict__.
+    __slots__ = ()
+
     def __new__(cls, position: int, text: str, type_: bool) -> Any:
         if text is None:
             raise ValueError("text is null")
@@ -380,6 +441,8 @@ class Token(namedtuple("Token", ["position", "text", "type"])):
 
 
 class PrimitiveParts(namedtuple("PrimitiveParts", ["type_name", "type_params"])):
+    __slots__ = ()
+
     def __new__(cls, type_name: str, type_params: List[str]) -> Any:
         if type_name is None:
             raise ValueError("type_name is null")
@@ -391,6 +454,10 @@ class PrimitiveParts(namedtuple("PrimitiveParts", ["type_name", "type_params"]))
         return f"{self.type_name}:{self.type_params}"
 
 
+# Mirrors is_valid_type_char: \w is str.isalnum() plus "_".
+_TOKEN_PATTERN = re.compile(r"(?P<name>[\w. $]+)|(?P<delimiter>[^\w. $])")
+
+
 class TypeParser:
     """
     Util functions to parse the Thrift column types (as strings) and return the
@@ -421,10 +488,32 @@ class TypeParser:
     # tokens are either type names or type parameters. The type parameters are
     # enclosed in parentheses.
     def tokenize(self, type_info_string: str) -> List[Token]:
+        # Quoted parameters need the character scanner below, everything else
+        # is a run of valid type characters or a single delimiter, which the
+        # regex engine can split in one pass.
+        if "'" in type_info_string:
+            return self._tokenize_quoted(type_info_string)
+        # Matches always have text, so skip the validation in Token.__new__.
+        # Type and field names repeat across columns, so intern them to
+        # share one string per name.
+        tokens = []
+        for match in _TOKEN_PATTERN.finditer(type_info_string):
+            if match.lastgroup == "name":
+                token = (match.start(), sys.intern(match.group()), True)
+            else:
+                token = (match.start(), match.group(), False)
+            tokens.append(Token._make(token))
+        return tokens
+
+    def _tokenize_quoted(self, type_info_string: str) -> List[Token]:
         tokens = []
+        length = len(type_info_string)
+        # Each character is checked up to three times while scanning, so
+        # classify them all once upfront.
+        valid = [self.is_valid_type_char(c) for c in type_info_string]
         begin = 0
         end = 1
-        while end <= len(type_info_string):
+        while end <= length:
             if (
                 begin > 0
                 and type_info_string[begin - 1] == "("
@@ -439,16 +528,8 @@ class TypeParser:
                 begin += 1
                 end += 1
 
-            if (
-                end == len(type_info_string)
-                or not self.is_valid_type_char(type_info_string[end - 1])
-                or not self.is_valid_type_char(type_info_string[end])
-            ):
-                token = Token(
-                    begin,
-                    type_info_string[begin:end],
-                    self.is_valid_type_char(type_info_string[begin]),
-                )
+            if end == length or not valid[end - 1] or not valid[end]:
+                token = Token(begin, type_info_string[begin:end], valid[begin])
                 tokens.append(token)
                 begin = end
             end += 1
@@ -518,102 +599,102 @@ class TypeParser:
 
     def parse_type(self) -> HType:
         token = self.expect("type")
+        type_name = token.text.lower()
 
         # first we take care of primitive types.
-        serde_val = get_serde_type_by_value(token.text)
-        if serde_val and serde_val not in (
-            HTypeCategory.LIST.value,
-            HTypeCategory.MAP.value,
-            HTypeCategory.STRUCT.value,
-            HTypeCategory.UNION.value,
-        ):
-            primitive_type = serde_to_primitive(serde_val)
-            if primitive_type and primitive_type is not PrimitiveCategory.UNKNOWN:
-                params = self.parse_params()
-                if primitive_type in (
-                    PrimitiveCategory.CHAR,
-                    PrimitiveCategory.VARCHAR,
-                ):
-                    if len(params) == 0:
-                        raise ValueError(
-                            "char/varchar type must have a length specified"
-                        )
-                    if len(params) == 1:
-                        length = int(params[0])
-                        if primitive_type is PrimitiveCategory.CHAR:
-                            return HCharType(length)
-                        elif primitive_type is PrimitiveCategory.VARCHAR:
-                            return HVarcharType(length)
-                    else:
-                        raise ValueError(
-                            f"Error: {token.text} type takes only one parameter, but instead "
-                            f"{len(params)} parameters are found."
-                        )
-                elif primitive_type is PrimitiveCategory.DECIMAL:
-                    if len(params) == 0:
-                        return HDecimalType(10, 0)
-                    elif len(params) == 1:
-                        precision = int(params[0])
-                        return HDecimalType(precision, 0)
-                    elif len(params) == 2:
-                        precision = int(params[0])
-                        scale = int(params[1])
-                        return HDecimalType(precision, scale)
-                    else:
-                        raise ValueError(
-                            f"Error: {token.text} type takes only two parameters, but instead "
-                            f"{len(params)} parameters are found."
-                        )
-                else:
-                    return HPrimitiveType(primitive_type)
+        primitive_type = _PRIMITIVE_KEYWORDS.get(type_name)
+        if primitive_type is not None:
+            params = self.parse_params()
+            if primitive_type in (
+                PrimitiveCategory.CHAR,
+                PrimitiveCategory.VARCHAR,
+            ):
+                if len(params) == 0:
+                    raise ValueError("char/varchar type must have a length specified")
+                if len(params) == 1:
+                    length = int(params[0])
+                    if primitive_type is PrimitiveCategory.CHAR:
+                        return HCharType(length)
+                    return HVarcharType(length)
+                raise ValueError(
+                    f"Error: {token.text} type takes only one parameter, but instead "
+                    f"{len(params)} parameters are found."
+                )
+            if primitive_type is PrimitiveCategory.DECIMAL:
+                if len(params) == 0:
+                    return HDecimalType(10, 0)
+                elif len(params) == 1:
+                    precision = int(params[0])
+                    return HDecimalType(precision, 0)
+                elif len(params) == 2:
+                    precision = int(params[0])
+                    scale = int(params[1])
+                    return HDecimalType(precision, scale)
+                raise ValueError(
+                    f"Error: {token.text} type takes only two parameters, but instead "
+                    f"{len(params)} parameters are found."
+                )
+            return HPrimitiveType(primitive_type)
 
         # next we take care of complex types.
-        if HTypeCategory.LIST.value == serde_val:
-            self.expect("<")
-            element_type = self.parse_type()
-            self.expect(">")
-            return HListType(element_type)
-
-        if HTypeCategory.MAP.value == serde_val:
-            self.expect("<")
-            key_type = self.parse_type()
-            self.expect(",")
-            value_type = self.parse_type()
-            self.expect(">")
-            return HMapType(key_type, value_type)
-
-        if HTypeCategory.STRUCT.value == serde_val:
-            self.expect("<")
-            names = []
-            types = []
-            token: Optional[Token] = self.peek()
-            while token is not None and token.text != ">":
-                field_name = self.expect("name")
-                self.expect(":")
-                field_type = self.parse_type()
-                names.append(field_name.text)
-                types.append(field_type)
-                token: Optional[Token] = self.peek()
-                if token is not None and token.text == ",":
-                    self.expect(",")
-                    token = self.peek()
-            self.expect(">")
-            return HStructType(names, types)
-
-        if HTypeCategory.UNION.value == serde_val:
-            self.expect("<")
-            types = []
-            token = self.peek()
-            while token is not None and token.text != ">":
-                field_type = self.parse_type()
-                types.append(field_type)
-                token = self.peek()
-                if token is not None and token.text == ",":
-                    self.expect(",")
-                    token = self.peek()
-            self.expect(">")
-            return HUnionType(types)
+        parse_complex = self._COMPLEX_KEYWORDS.get(type_name)
+        if parse_complex is not None:
+            return parse_complex(self)
 
         # if we reach this point and we haven't figure out what to do, then we
         # better raise an error.
         raise ValueError(f"Error: {token.text} is not a valid type.")
+
+    def _parse_list(self) -> HType:
+        self.expect("<")
+        element_type = self.parse_type()
+        self.expect(">")
+        return HListType(element_type)
+
+    def _parse_map(self) -> HType:
+        self.expect("<")
+        key_type = self.parse_type()
+        self.expect(",")
+        value_type = self.parse_type()
+        self.expect(">")
+        return HMapType(key_type, value_type)
+
+    def _parse_struct(self) -> HType:
+        self.expect("<")
+        names = []
+        types = []
+        token: Optional[Token] = self.peek()
+        while token is not None and token.text != ">":
+            field_name = self.expect("name")
+            self.expect(":")
+            field_type = self.parse_type()
+            names.append(field_name.text)
+            types.append(field_type)
+            token = self.peek()
+            if token is not None and token.text == ",":
+                self.expect(",")
+                token = self.peek()
+        self.expect(">")
+        return HStructType(names, types)
+
+    def _parse_union(self) -> HType:
+        self.expect("<")
+        types = []
+        token: Optional[Token] = self.peek()
+        while token is not None and token.text != ">":
+            field_type = self.parse_type()
+            types.append(field_type)
+            token = self.peek()
+            if token is not None and token.text == ",":
+                self.expect(",")
+                token = self.peek()
+        self.expect(">")
+        return HUnionType(types)
+
+    # Complex type keywords mapped to the method that parses the rest of the type.
+    _COMPLEX_KEYWORDS = {
+        SerdeTypeNameConstants.LIST.value: _parse_list,
+        SerdeTypeNameConstants.MAP.value: _parse_map,
+        SerdeTypeNameConstants.STRUCT.value: _parse_struct,
+        SerdeTypeNameConstants.UNION.value: _parse_union,
+    }
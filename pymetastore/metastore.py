@@ -1,8 +1,31 @@
-from dataclasses import dataclass, field
+import functools
+import inspect
+import logging
+import socket
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    overload,
+)
 
-from thrift.protocol.TBinaryProtocol import TBinaryProtocol
+from thrift.Thrift import TException
+from thrift.protocol.TBinaryProtocol import TBinaryProtocolAccelerated
+from thrift.protocol.TCompactProtocol import TCompactProtocolAccelerated
+from thrift.protocol.TProtocol import TProtocolException
 from thrift.transport import TSocket, TTransport
 
 from .hive_metastore import ThriftHiveMetastore as hms
@@ -10,6 +33,10 @@ from .hive_metastore.ttypes import (
     Database,
     FieldSchema,
     Partition,
+    PartitionListComposingSpec,
+    PartitionSpec,
+    PartitionSpecWithSharedSD,
+    PartitionWithoutSD,
     PrincipalType,
     SerDeInfo,
     StorageDescriptor,
@@ -27,6 +54,28 @@ from .stats import (
     StringTypeStats,
 )
 
+T = TypeVar("T")
+
+_logger = logging.getLogger(__name__)
+
+
+def _slotted(cls: Type[T]) -> Type[T]:
+    """
+    Rebuilds a dataclass with `__slots__` for its fields, dropping the
+    per-instance `__dict__`. This is what `dataclass(slots=True)` does, which
+    is only available from Python 3.10.
+    """
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict["__slots__"] = field_names
+    for name in field_names:
+        # Drop the class attributes holding the field defaults, they would
+        # otherwise conflict with the slots. __init__ keeps its own copy.
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
 
 class HPrincipalType(Enum):
     ROLE = "ROLE"
@@ -60,6 +109,7 @@ class HDatabase:
     parameters: Optional[Dict[str, str]] = None
 
 
+@_slotted
 @dataclass
 class HColumn:
     name: str
@@ -72,6 +122,7 @@ class HSortingOrder(Enum):
     DESC = 0
 
 
+@_slotted
 @dataclass
 class HSortingColumn:
     column: str
@@ -83,6 +134,7 @@ class BucketingVersion(Enum):
     V2 = 2
 
 
+@_slotted
 @dataclass
 class HiveBucketProperty:
     bucketed_by: List[str]
@@ -91,6 +143,7 @@ class HiveBucketProperty:
     sorting_columns: List[HSortingColumn] = field(default_factory=list)
 
 
+@_slotted
 @dataclass
 class StorageFormat:
     serde: str
@@ -98,6 +151,7 @@ class StorageFormat:
     output_format: str
 
 
+@_slotted
 @dataclass
 class HStorage:
     storage_format: StorageFormat
@@ -107,6 +161,7 @@ class HStorage:
     serde_parameters: Optional[Dict[str, str]] = None
 
 
+@_slotted
 @dataclass
 class HTable:
     database_name: str
@@ -129,6 +184,7 @@ class HSkewedInfo:
     skewed_col_value_location_maps: Dict[List[str], str]
 
 
+@_slotted
 @dataclass
 class HPartition:
     database_name: str
@@ -140,23 +196,116 @@ class HPartition:
     sd: HStorage
     cat_name: str
     write_id: int
+    # None means the columns were not loaded, they are only set when the
+    # partition getters are passed the table.
+    columns: Optional[List[HColumn]] = None
+
+
+def _cached(method: Callable[..., T]) -> Callable[..., T]:
+    """
+    Caches the results of a read-only HMS method for `HMS.ttl_seconds`. The
+    cache key is the method name followed by its arguments, so the database
+    name comes first and the table name second, as `HMS.invalidate` expects.
+    Hive names are case-insensitive, so the names are lowercased in the key.
+    Once the cache holds `HMS.cache_size` entries the least recently used one
+    is evicted. Cached results are returned as is, so every caller gets the
+    same instance and must not mutate it.
+    """
+    signature = inspect.signature(method)
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self: "HMS", *args, **kwargs) -> T:
+        if self.ttl_seconds <= 0 or self.cache_size <= 0:
+            return method(self, *args, **kwargs)
+
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        key = (name, *_name_keys(list(arguments.values())[1:]))
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None and now - cached[0] < self.ttl_seconds:
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        value = method(self, *args, **kwargs)
+        self._remember(key, value, now)
+        return value
+
+    return wrapper
+
+
+def _name_keys(names: List[Any]) -> Tuple[Any, ...]:
+    return tuple(name.lower() if isinstance(name, str) else name for name in names)
 
 
 class HMS:
-    def __init__(self, client: hms.Client):
+    # Results of the list_* and get_database/get_table calls are cached for
+    # ttl_seconds and shared between callers, so treat them as read-only and
+    # copy them (e.g. with copy.deepcopy) before making changes.
+    # At most cache_size results are kept. Set ttl_seconds or cache_size to 0
+    # to disable caching.
+    def __init__(
+        self,
+        client: hms.Client,
+        ttl_seconds: float = 60.0,
+        cache_size: int = 1024,
+    ):
         self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, Tuple[float, Any]]" = OrderedDict()
 
     @staticmethod
-    def create(host: str = "localhost", port: int = 9083) -> "_HMSConnection":
-        return _HMSConnection(host, port)
+    def create(
+        host: str = "localhost",
+        port: int = 9083,
+        protocol: str = "binary",
+        transport: str = "buffered",
+        ttl_seconds: float = 60.0,
+        cache_size: int = 1024,
+    ) -> "_HMSConnection":
+        _check_connection_options(protocol, transport)
+        return _HMSConnection(host, port, protocol, transport, ttl_seconds, cache_size)
+
+    def _remember(self, key: tuple, value: Any, now: float) -> None:
+        self._cache[key] = (now, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def invalidate(
+        self,
+        database_name: Optional[str] = None,
+        table_name: Optional[str] = None,
+    ) -> None:
+        """
+        Drops cached results. With no arguments the whole cache is cleared;
+        with a database (and optionally a table) only the entries for it are
+        dropped, along with the listings that would include it.
+        """
+        if database_name is None:
+            self._cache.clear()
+            return
+
+        database_name = database_name.lower()
+        if table_name is not None:
+            table_name = table_name.lower()
+        for key in list(self._cache):
+            if table_name is None:
+                stale = key[0] == "list_databases" or key[1:2] == (database_name,)
+            else:
+                stale = key[1:3] == (database_name, table_name) or key[:2] == (
+                    "list_tables",
+                    database_name,
+                )
+            if stale:
+                self._cache.pop(key, None)
 
+    @_cached
     def list_databases(self) -> List[str]:
-        databases = self.client.get_all_databases()
-        db_names = []
-        for database in databases:
-            db_names.append(database)
-        return db_names
+        return self.client.get_all_databases()
 
+    @_cached
     def get_database(self, name: str) -> HDatabase:
         db: Database = self.client.get_database(name)
 
@@ -176,20 +325,20 @@ class HMS:
             db.parameters,
         )
 
+    @_cached
     def list_tables(self, database_name: str) -> List[str]:
         return self.client.get_all_tables(database_name)
 
+    @_cached
     def list_columns(self, database_name: str, table_name: str) -> List[str]:
         # TODO: Rather than ignore these pyright errors, do appropriate None handling
         columns = self.client.get_table(
             database_name,
             table_name,
         ).sd.cols  # pyright: ignore[reportOptionalMemberAccess]
-        self.client.get_schema(database_name, table_name)
-        column_names = []
-        for column in columns:  # pyright: ignore[reportOptionalIterable]
-            column_names.append(column.name)
-        return column_names
+        return [
+            column.name for column in columns  # pyright: ignore[reportOptionalIterable]
+        ]
 
     def list_partitions(
         self,
@@ -209,89 +358,117 @@ class HMS:
         database_name: str,
         table_name: str,
         max_parts: int = -1,
+        names: Optional[List[str]] = None,
+        partition_filter: Optional[str] = None,
+        table: Optional[HTable] = None,
     ) -> List[HPartition]:
-        result_partitions = []
-        partitions: List[Partition] = self.client.get_partitions(
-            database_name,
-            table_name,
-            max_parts,
-        )
-
-        assert isinstance(partitions, list)
-
-        for partition in partitions:
-            assert isinstance(partition, Partition)
-            assert isinstance(partition.sd, StorageDescriptor)
-            assert isinstance(partition.sd.serdeInfo, SerDeInfo)
-            assert isinstance(partition.dbName, str)
-            assert isinstance(partition.tableName, str)
-            assert isinstance(partition.values, list)
-            assert isinstance(partition.parameters, dict)
-            assert isinstance(partition.createTime, int)
-            assert isinstance(partition.lastAccessTime, int)
-            assert isinstance(partition.catName, str)
-
-            serialization_lib = (
-                ""
-                if partition.sd.serdeInfo.serializationLib is None
-                else partition.sd.serdeInfo.serializationLib
-            )
-            input_format = (
-                "" if partition.sd.inputFormat is None else partition.sd.inputFormat
-            )
-            output_format = (
-                "" if partition.sd.outputFormat is None else partition.sd.outputFormat
+        """
+        Returns the partitions of a table. When `names` is given only those
+        partitions are fetched, and when `partition_filter` is given the metastore
+        evaluates the filter expression (e.g. `ds > "2023-01-01"`) and only
+        returns the matching partitions.
+
+        The columns each partition carries are not decoded. Pass the already
+        fetched `table` to have every partition share its columns, otherwise
+        `HPartition.columns` is None.
+        """
+        if names is not None and partition_filter is not None:
+            raise ValueError("Expected only one of names or partition_filter to be set")
+
+        if names is not None:
+            partitions: List[Partition] = self.client.get_partitions_by_names(
+                database_name,
+                table_name,
+                names,
             )
-            bucket_cols = (
-                [] if partition.sd.bucketCols is None else partition.sd.bucketCols
+        elif partition_filter is not None:
+            partitions = self.client.get_partitions_by_filter(
+                database_name,
+                table_name,
+                partition_filter,
+                max_parts,
             )
-            sort_cols = [] if partition.sd.sortCols is None else partition.sd.sortCols
-            num_buckets = (
-                0 if partition.sd.numBuckets is None else partition.sd.numBuckets
-            )
-            is_skewed = partition.sd.skewedInfo is not None
-
-            assert isinstance(serialization_lib, str)
-            assert isinstance(input_format, str)
-            assert isinstance(output_format, str)
-            assert isinstance(bucket_cols, list)
-            assert isinstance(sort_cols, list)
-            assert isinstance(num_buckets, int)
-
-            storage_format = StorageFormat(
-                serialization_lib,
-                input_format,
-                output_format,
+        else:
+            partitions = self.client.get_partitions(
+                database_name,
+                table_name,
+                max_parts,
             )
 
-            bucket_property = HiveBucketProperty(
-                bucket_cols,
-                num_buckets,
-                BucketingVersion.V1,
-                sort_cols,
-            )
+        columns = None if table is None else table.columns
+        shared = _SharedStorage()
+        return [
+            _partition_from_thrift(partition, shared, columns)
+            for partition in partitions
+        ]
 
-            sd = HStorage(
-                storage_format,
-                is_skewed,
-                partition.sd.location,
-                bucket_property,
-                partition.sd.serdeInfo.parameters,
-            )
+    def iter_partitions(
+        self,
+        database_name: str,
+        table_name: str,
+        batch_size: int = 1000,
+        table: Optional[HTable] = None,
+    ) -> Iterator[HPartition]:
+        """
+        Iterates over the partitions of a table, fetching them from the
+        metastore `batch_size` partitions at a time. Only the partition names
+        and the current batch are held in memory, and nothing past the last
+        batch consumed is fetched when the caller stops early.
+        """
+        if batch_size < 1:
+            raise ValueError(f"Expected batch_size to be positive, got {batch_size}")
+
+        names = self.list_partitions(database_name, table_name)
+        columns = None if table is None else table.columns
+        return self._iter_partitions(
+            database_name,
+            table_name,
+            names,
+            batch_size,
+            columns,
+        )
 
-            result_partition = HPartition(
-                partition.dbName,
-                partition.tableName,
-                partition.values,
-                partition.parameters,
-                partition.createTime,
-                partition.lastAccessTime,
-                sd,
-                partition.catName,
-                partition.writeId,
+    def _iter_partitions(
+        self,
+        database_name: str,
+        table_name: str,
+        names: List[str],
+        batch_size: int,
+        columns: Optional[List[HColumn]],
+    ) -> Iterator[HPartition]:
+        shared = _SharedStorage()
+        for start in range(0, len(names), batch_size):
+            partitions: List[Partition] = self.client.get_partitions_by_names(
+                database_name,
+                table_name,
+                names[start : start + batch_size],
             )
+            for partition in partitions:
+                yield _partition_from_thrift(partition, shared, columns)
 
-            result_partitions.append(result_partition)
+    def get_partitions_spec(
+        self,
+        database_name: str,
+        table_name: str,
+        max_parts: int = -1,
+        table: Optional[HTable] = None,
+    ) -> List[HPartition]:
+        """
+        Returns the partitions of a table using the metastore's partition
+        spec API, which groups partitions sharing a storage descriptor so the
+        descriptor is sent and decoded once per group instead of once per
+        partition.
+        """
+        specs: List[PartitionSpec] = self.client.get_partitions_pspec(
+            database_name,
+            table_name,
+            max_parts,
+        )
+
+        columns = None if table is None else table.columns
+        result_partitions = []
+        for spec in specs:
+            result_partitions.extend(_partitions_from_spec(spec, columns))
 
         return result_partitions
 
@@ -300,6 +477,7 @@ class HMS:
         database_name: str,
         table_name: str,
         partition_name: str,
+        table: Optional[HTable] = None,
     ) -> HPartition:
         partition: Partition = self.client.get_partition_by_name(
             database_name,
@@ -307,324 +485,42 @@ class HMS:
             partition_name,
         )
         assert partition is not None
-        assert isinstance(partition, Partition)
-        assert isinstance(partition.sd, StorageDescriptor)
-        assert isinstance(partition.sd.serdeInfo, SerDeInfo)
-        assert isinstance(partition.sd.serdeInfo.serializationLib, str)
-        assert partition.sd.inputFormat is not None
-        assert partition.sd.outputFormat is not None
-
-        serialization_lib = partition.sd.serdeInfo.serializationLib
-        input_format = partition.sd.inputFormat
-        output_format = partition.sd.outputFormat
-        storage_format = StorageFormat(
-            serialization_lib,
-            input_format,
-            output_format,
-        )
-        sort_cols = [] if partition.sd.sortCols is None else partition.sd.sortCols
-        bucket_cols = [] if partition.sd.bucketCols is None else partition.sd.bucketCols
-        num_buckets = partition.sd.numBuckets or 0
-        is_skewed = partition.sd.skewedInfo is not None
-        location = "" if partition.sd.location is None else partition.sd.location
-        serde_parameters = (
-            {}
-            if partition.sd.serdeInfo.parameters is None
-            else partition.sd.serdeInfo.parameters
-        )
-        cat_name = "" if partition.catName is None else partition.catName
-        write_id = -1 if partition.writeId is None else partition.writeId
-        last_access_time = (
-            -1 if partition.lastAccessTime is None else partition.lastAccessTime
-        )
-        partition_parameters = (
-            {} if partition.parameters is None else partition.parameters
-        )
-        create_time = -1 if partition.createTime is None else partition.createTime
-        values = [] if partition.values is None else partition.values
-        db_name = partition.dbName
-        partition_table_name = partition.tableName
-
-        assert isinstance(sort_cols, list)
-        assert isinstance(bucket_cols, list)
-        assert isinstance(num_buckets, int)
-        assert isinstance(location, str)
-        assert isinstance(serde_parameters, dict)
-        assert isinstance(cat_name, str)
-        assert isinstance(write_id, int)
-        assert isinstance(last_access_time, int)
-        assert isinstance(partition_parameters, dict)
-        assert isinstance(create_time, int)
-        assert isinstance(values, list)
-        assert isinstance(db_name, str)
-        assert isinstance(partition_table_name, str)
-
-        bucket_property = HiveBucketProperty(
-            bucket_cols,
-            num_buckets,
-            BucketingVersion.V1,
-            sort_cols,
-        )
-        sd = HStorage(
-            storage_format,
-            is_skewed,
-            location,
-            bucket_property,
-            serde_parameters,
-        )
-        result_partition = HPartition(
-            db_name,
-            partition_table_name,
-            values,
-            partition_parameters,
-            create_time,
-            last_access_time,
-            sd,
-            cat_name,
-            write_id,
-        )
-
-        return result_partition
+        columns = None if table is None else table.columns
+        return _partition_from_thrift(partition, columns=columns)
 
+    @_cached
     def get_table(self, database_name: str, table_name: str) -> HTable:
         table: Table = self.client.get_table(database_name, table_name)
-
-        columns = []
-
-        partition_columns = []
-        if table.partitionKeys is not None:
-            if isinstance(table.partitionKeys, list):
-                t_part_columns: List[FieldSchema] = table.partitionKeys
-                for column in t_part_columns:
-                    if column is not None:
-                        if isinstance(column, FieldSchema):
-                            if column.type is not None:
-                                type_parser = TypeParser(column.type)
-                            else:
-                                raise TypeError("Expected type to be str, got None")
-                            if column.comment is not None:
-                                comment = column.comment
-                            else:
-                                comment = ""
-                            if column.name is not None:
-                                name = column.name
-                            else:
-                                raise TypeError("Expected name to be str, got None")
-                            partition_columns.append(
-                                HColumn(name, type_parser.parse_type(), comment)
-                            )
-
-        if table.sd is not None:
-            if table.sd.cols is not None:
-                if isinstance(table.sd.cols, list):
-                    t_columns: List[FieldSchema] = table.sd.cols
-                    for column in t_columns:
-                        if column is not None:
-                            if isinstance(column, FieldSchema):
-                                if column.type is not None:
-                                    type_parser = TypeParser(column.type)
-                                else:
-                                    raise TypeError("Expected type to be str, got None")
-                                if column.comment is not None:
-                                    comment = column.comment
-                                else:
-                                    comment = ""
-                                if column.name is not None:
-                                    name = column.name
-                                else:
-                                    raise TypeError("Expected name to be str, got None")
-                                columns.append(
-                                    HColumn(name, type_parser.parse_type(), comment)
-                                )
-
-            if table.sd.serdeInfo is not None:
-                if isinstance(table.sd.serdeInfo, SerDeInfo):
-                    if table.sd.serdeInfo.serializationLib is not None:
-                        if isinstance(table.sd.serdeInfo.serializationLib, str):
-                            serde = table.sd.serdeInfo.serializationLib
-                        else:
-                            raise TypeError(
-                                f"Expected serializationLib to be str, got {type(table.sd.serdeInfo.serializationLib)}"
-                            )
-                    else:
-                        raise TypeError(
-                            f"Expected serdeInfo to be str, got {type(table.sd.serdeInfo)}"
-                        )
-                else:
-                    raise TypeError(
-                        f"Expected serdeInfo to be SerDeInfo, got {type(table.sd.serdeInfo)}"
-                    )
-            else:
-                raise TypeError("Expected serdeInfo to be SerDeInfo, got None")
-
-            if table.sd.inputFormat is not None:
-                if isinstance(table.sd.inputFormat, str):
-                    input_format = table.sd.inputFormat
-                else:
-                    raise TypeError(
-                        f"Expected inputFormat to be str, got {type(table.sd.inputFormat)}"
-                    )
-            else:
-                raise TypeError("Expected inputFormat to be str, got None")
-
-            if table.sd.outputFormat is not None:
-                if isinstance(table.sd.outputFormat, str):
-                    output_format = table.sd.outputFormat
-                else:
-                    raise TypeError(
-                        f"Expected outputFormat to be str, got {type(table.sd.outputFormat)}"
-                    )
-            else:
-                raise TypeError("Expected outputFormat to be str, got None")
-
-            storage_format = StorageFormat(serde, input_format, output_format)
-
-            bucket_property = None
-            if table.sd.bucketCols is not None:
-                sort_cols = []
-                if table.sd.sortCols is not None:
-                    if isinstance(table.sd.sortCols, list):
-                        for order in table.sd.sortCols:
-                            sort_cols.append(HSortingColumn(order.col, order.order))
-                    else:
-                        raise TypeError(
-                            f"Expected bucketCols to be list, got {type(table.sd.sortCols)}"
-                        )
-
-                version = BucketingVersion.V1
-                if table.parameters is not None:
-                    if isinstance(table.parameters, dict):
-                        if (
-                            table.parameters.get(
-                                "TABLE_BUCKETING_VERSION", BucketingVersion.V1
-                            )
-                            == BucketingVersion.V2
-                        ):
-                            version = BucketingVersion.V2
-                    else:
-                        raise TypeError(
-                            f"Expected parameters to be dict, got {type(table.parameters)}"
-                        )
-                else:
-                    raise TypeError(
-                        f"Expected parameters to be dict, got {type(table.parameters)}"
-                    )
-
-                if table.sd.numBuckets is not None:
-                    if isinstance(table.sd.numBuckets, int):
-                        num_buckets = table.sd.numBuckets
-                    else:
-                        raise TypeError(
-                            f"Expected numBuckets to be int, got {type(table.sd.numBuckets)}"
-                        )
-                else:
-                    raise TypeError(
-                        f"Expected numBuckets to be int, got {type(table.sd.numBuckets)}"
-                    )
-
-                bucket_property = HiveBucketProperty(
-                    table.sd.bucketCols, num_buckets, version, sort_cols
-                )
-
-            if table.sd.skewedInfo is None:
-                is_skewed = False
-            else:
-                is_skewed = True
-
-            if table.sd.location is not None:
-                if isinstance(table.sd.location, str):
-                    location = table.sd.location
-                else:
-                    raise TypeError(
-                        f"Expected location to be str, got {type(table.sd.location)}"
-                    )
-            else:
-                location = None
-
-            if table.sd.serdeInfo is not None:
-                if isinstance(table.sd.serdeInfo, SerDeInfo):
-                    serde_info = table.sd.serdeInfo
-                else:
-                    raise TypeError(
-                        f"Expected serdeInfo to be SerDeInfo, got {type(table.sd.serdeInfo)}"
-                    )
-            else:
-                raise TypeError(
-                    f"Expected serdeInfo to be SerDeInfo, got {type(table.sd.serdeInfo)}"
-                )
-            if serde_info.parameters is not None:
-                if isinstance(serde_info.parameters, dict):
-                    serde_parameters = serde_info.parameters
-                else:
-                    raise TypeError(
-                        f"Expected serdeInfo.parameters to be dict, got {type(serde_info.parameters)}"
-                    )
-            else:
-                raise TypeError(
-                    f"Expected serdeInfo.parameters to be dict, got {type(serde_info.parameters)}"
-                )
-        else:
-            raise TypeError(
-                f"Expected sd to be StorageDescriptor, got {type(table.sd)}"
-            )
-
-        storage = HStorage(
-            storage_format,
-            is_skewed,
-            location,
-            bucket_property,
-            serde_parameters,
-        )
-
-        if table.parameters is not None:
-            if isinstance(table.parameters, dict):
-                params = table.parameters
-            else:
-                raise TypeError(
-                    f"Expected parameters to be dict, got {type(table.parameters)}"
-                )
-        else:
-            raise TypeError(
-                f"Expected parameters to be dict, got {type(table.parameters)}"
-            )
-
-        if table.tableType is not None:
-            if isinstance(table.tableType, str):
-                table_type = table.tableType
-            else:
-                raise TypeError(
-                    f"Expected tableType to be str, got {type(table.tableType)}"
-                )
-        else:
-            raise TypeError(
-                f"Expected tableType to be str, got {type(table.tableType)}"
-            )
-
-        if table.tableName is not None:
-            table_name = table.tableName
-        else:
-            raise TypeError(
-                f"Expected tableName to be str, got {type(table.tableName)}"
-            )
-
-        if table.dbName is not None:
-            db_name = table.dbName
-        else:
-            raise TypeError(f"Expected dbName to be str, got {type(table.dbName)}")
-
-        return HTable(
-            db_name,
-            table_name,
-            table_type,
-            columns,
-            partition_columns,
-            storage,
-            params,
-            table.viewOriginalText,
-            table.viewExpandedText,
-            table.writeId,
-            table.owner,
+        return _table_from_thrift(table)
+
+    def get_tables(
+        self, database_name: str, table_names: List[str]
+    ) -> Tuple[List[HTable], Dict[str, Exception]]:
+        """
+        Fetches several tables of a database in a single call. Tables that
+        don't exist are left out of the result. Rather than failing the whole
+        batch, tables that can't be converted are returned separately, mapped
+        to the error raised for them: a TypeError for a missing or mistyped
+        field, or a ValueError for a column type that can't be parsed. The
+        converted tables are added to the `get_table` cache.
+        """
+        t_tables: List[Table] = self.client.get_table_objects_by_name(
+            database_name, table_names
         )
+        tables = []
+        failures: Dict[str, Exception] = {}
+        for t_table in t_tables:
+            try:
+                tables.append(_table_from_thrift(t_table))
+            except (TypeError, ValueError) as e:
+                failures[str(t_table.tableName)] = e
+
+        if self.ttl_seconds > 0 and self.cache_size > 0:
+            now = time.monotonic()
+            for table in tables:
+                key = ("get_table", *_name_keys([database_name, table.name]))
+                self._remember(key, table, now)
+        return tables, failures
 
     def get_table_stats(
         self,
@@ -730,19 +626,634 @@ class HMS:
         return result_columns
 
 
+# The accelerated protocols fall back to their pure Python implementations
+# when the fastbinary C extension isn't available.
+_PROTOCOLS = {
+    "binary": TBinaryProtocolAccelerated,
+    "compact": TCompactProtocolAccelerated,
+}
+
+# Large listings (e.g. get_partitions) return megabytes; the thrift default of
+# 4 KiB turns them into thousands of small recv() calls.
+_READ_BUFFER_SIZE = 64 * 1024
+
+_TRANSPORTS = {
+    "buffered": functools.partial(
+        TTransport.TBufferedTransport,
+        rbuf_size=_READ_BUFFER_SIZE,
+    ),
+    "framed": TTransport.TFramedTransport,
+}
+
+# Linux only: drop connections whose sent data stays unacknowledged this long
+# instead of waiting for the kernel's much longer retransmission timeout.
+_TCP_USER_TIMEOUT_MS = 60 * 1000
+
+
+# Column type strings repeat heavily across columns and tables. HType instances
+# are never mutated after parsing, so the parsed types can be shared.
+@functools.lru_cache(maxsize=4096)
+def _parse_type(type_string: str) -> HType:
+    return TypeParser(type_string).parse_type()
+
+
+def _columns_from_thrift(t_columns: Optional[List[FieldSchema]]) -> List[HColumn]:
+    columns: List[HColumn] = []
+    for column in t_columns or []:
+        # Thrift only ever decodes FieldSchema structs into this list.
+        assert isinstance(column, FieldSchema)
+        name, type_string, comment = column.name, column.type, column.comment
+        if type_string is None:
+            raise TypeError("Expected type to be str, got None")
+        if name is None:
+            raise TypeError("Expected name to be str, got None")
+        if comment is None:
+            comment = ""
+        columns.append(HColumn(name, _parse_type(type_string), comment))
+    return columns
+
+
+@overload
+def _req(obj: Any, name: str, typ: Type[T], optional: Literal[False] = False) -> T:
+    ...
+
+
+@overload
+def _req(obj: Any, name: str, typ: Type[T], optional: Literal[True]) -> Optional[T]:
+    ...
+
+
+def _req(obj: Any, name: str, typ: Type[T], optional: bool = False) -> Optional[T]:
+    value = getattr(obj, name)
+    if value is None and optional:
+        return value
+    if not isinstance(value, typ):
+        raise TypeError(
+            f"Expected {name} to be {typ.__name__}, got {type(value).__name__}"
+        )
+    return value
+
+
+def _table_from_thrift(table: Table) -> HTable:
+    partition_columns = _columns_from_thrift(table.partitionKeys)
+
+    sd = _req(table, "sd", StorageDescriptor)
+    serde_info = _req(sd, "serdeInfo", SerDeInfo)
+    params = _req(table, "parameters", dict)
+
+    columns = _columns_from_thrift(sd.cols)
+    storage_format = StorageFormat(
+        _req(serde_info, "serializationLib", str),
+        _req(sd, "inputFormat", str),
+        _req(sd, "outputFormat", str),
+    )
+
+    bucket_property = None
+    bucket_cols = sd.bucketCols
+    if bucket_cols is not None:
+        sort_cols = [
+            HSortingColumn(order.col, order.order)
+            for order in _req(sd, "sortCols", list, optional=True) or []
+        ]
+        version = BucketingVersion.V1
+        if (
+            params.get("TABLE_BUCKETING_VERSION", BucketingVersion.V1)
+            == BucketingVersion.V2
+        ):
+            version = BucketingVersion.V2
+        bucket_property = HiveBucketProperty(
+            bucket_cols,
+            _req(sd, "numBuckets", int),
+            version,
+            sort_cols,
+        )
+
+    storage = HStorage(
+        storage_format,
+        sd.skewedInfo is not None,
+        _req(sd, "location", str, optional=True),
+        bucket_property,
+        _req(serde_info, "parameters", dict),
+    )
+
+    return HTable(
+        _req(table, "dbName", str),
+        _req(table, "tableName", str),
+        _req(table, "tableType", str),
+        columns,
+        partition_columns,
+        storage,
+        params,
+        table.viewOriginalText,
+        table.viewExpandedText,
+        table.writeId,
+        table.owner,
+    )
+
+
+def _storage_format_from_thrift(sd: StorageDescriptor) -> StorageFormat:
+    serde = sd.serdeInfo
+    assert isinstance(serde, SerDeInfo)
+
+    serialization_lib = serde.serializationLib or ""
+    input_format = sd.inputFormat or ""
+    output_format = sd.outputFormat or ""
+
+    assert isinstance(serialization_lib, str)
+    assert isinstance(input_format, str)
+    assert isinstance(output_format, str)
+
+    return StorageFormat(serialization_lib, input_format, output_format)
+
+
+def _bucket_property_from_thrift(sd: StorageDescriptor) -> HiveBucketProperty:
+    sort_cols = sd.sortCols or []
+    bucket_cols = sd.bucketCols or []
+    num_buckets = sd.numBuckets or 0
+
+    assert isinstance(sort_cols, list)
+    assert isinstance(bucket_cols, list)
+    assert isinstance(num_buckets, int)
+
+    return HiveBucketProperty(bucket_cols, num_buckets, BucketingVersion.V1, sort_cols)
+
+
+def _storage_from_thrift(
+    sd: StorageDescriptor,
+    storage_format: StorageFormat,
+    bucket_property: HiveBucketProperty,
+    location: Optional[str],
+) -> HStorage:
+    serde = sd.serdeInfo
+    assert isinstance(serde, SerDeInfo)
+
+    is_skewed = sd.skewedInfo is not None
+    location = location or ""
+    serde_parameters = serde.parameters or {}
+
+    assert isinstance(location, str)
+    assert isinstance(serde_parameters, dict)
+
+    return HStorage(
+        storage_format,
+        is_skewed,
+        location,
+        bucket_property,
+        serde_parameters,
+    )
+
+
+_FormatKey = Tuple[Optional[str], Optional[str], Optional[str]]
+_BucketKey = Tuple[Tuple[str, ...], Optional[int], Tuple[Tuple[str, int], ...]]
+
+
+@dataclass
+class _SharedStorage:
+    """
+    The storage formats and bucket properties built so far for one partition
+    listing, keyed by the thrift fields they are built from.
+    """
+
+    formats: Dict[_FormatKey, StorageFormat] = field(default_factory=dict)
+    bucket_properties: Dict[_BucketKey, HiveBucketProperty] = field(
+        default_factory=dict
+    )
+
+
+def _shared_storage_parts(
+    sd: StorageDescriptor,
+    shared: _SharedStorage,
+) -> Tuple[StorageFormat, HiveBucketProperty]:
+    # Partitions of a table almost always share their serde, formats and
+    # bucketing, so reuse the objects built for an earlier partition rather
+    # than allocating identical ones per partition.
+    serde = sd.serdeInfo
+    assert isinstance(serde, SerDeInfo)
+
+    format_key: _FormatKey = (
+        serde.serializationLib,
+        sd.inputFormat,
+        sd.outputFormat,
+    )
+    storage_format = shared.formats.get(format_key)
+    if storage_format is None:
+        storage_format = _storage_format_from_thrift(sd)
+        shared.formats[format_key] = storage_format
+
+    bucket_key: _BucketKey = (
+        tuple(sd.bucketCols or ()),
+        sd.numBuckets,
+        tuple((order.col, order.order) for order in sd.sortCols or ()),
+    )
+    bucket_property = shared.bucket_properties.get(bucket_key)
+    if bucket_property is None:
+        bucket_property = _bucket_property_from_thrift(sd)
+        shared.bucket_properties[bucket_key] = bucket_property
+
+    return storage_format, bucket_property
+
+
+def _partition_from_thrift(
+    partition: Partition,
+    shared: Optional[_SharedStorage] = None,
+    columns: Optional[List[HColumn]] = None,
+) -> HPartition:
+    sd = partition.sd
+    assert isinstance(sd, StorageDescriptor)
+
+    if shared is None:
+        storage_format = _storage_format_from_thrift(sd)
+        bucket_property = _bucket_property_from_thrift(sd)
+    else:
+        storage_format, bucket_property = _shared_storage_parts(sd, shared)
+
+    write_id = partition.writeId
+    last_access_time = partition.lastAccessTime
+    create_time = partition.createTime
+    cat_name = partition.catName or ""
+    partition_parameters = partition.parameters or {}
+    values = partition.values or []
+    db_name = partition.dbName
+    partition_table_name = partition.tableName
+
+    assert isinstance(cat_name, str)
+    assert write_id is None or isinstance(write_id, int)
+    assert last_access_time is None or isinstance(last_access_time, int)
+    assert create_time is None or isinstance(create_time, int)
+    assert isinstance(partition_parameters, dict)
+    assert isinstance(values, list)
+    assert isinstance(db_name, str)
+    assert isinstance(partition_table_name, str)
+
+    return HPartition(
+        db_name,
+        partition_table_name,
+        values,
+        partition_parameters,
+        -1 if create_time is None else create_time,
+        -1 if last_access_time is None else last_access_time,
+        _storage_from_thrift(sd, storage_format, bucket_property, sd.location),
+        cat_name,
+        -1 if write_id is None else write_id,
+        columns,
+    )
+
+
+def _partitions_from_spec(
+    spec: PartitionSpec,
+    columns: Optional[List[HColumn]] = None,
+) -> List[HPartition]:
+    if spec.partitionList is not None:
+        assert isinstance(spec.partitionList, PartitionListComposingSpec)
+        shared = _SharedStorage()
+        return [
+            _partition_from_thrift(partition, shared, columns)
+            for partition in spec.partitionList.partitions or []
+        ]
+
+    if spec.sharedSDPartitionSpec is None:
+        # A spec may carry neither list, e.g. for a group with no partitions.
+        return []
+    assert isinstance(spec.sharedSDPartitionSpec, PartitionSpecWithSharedSD)
+    shared_sd = spec.sharedSDPartitionSpec.sd
+    assert isinstance(shared_sd, StorageDescriptor)
+
+    # Every partition in the group shares the storage descriptor, so the
+    # storage format and bucket property only need to be decoded once.
+    storage_format = _storage_format_from_thrift(shared_sd)
+    bucket_property = _bucket_property_from_thrift(shared_sd)
+    root_location = "" if shared_sd.location is None else shared_sd.location
+    cat_name = "" if spec.catName is None else spec.catName
+    db_name = spec.dbName
+    partition_table_name = spec.tableName
+
+    assert isinstance(cat_name, str)
+    assert isinstance(db_name, str)
+    assert isinstance(partition_table_name, str)
+
+    result_partitions = []
+    for partition in spec.sharedSDPartitionSpec.partitions or []:
+        assert isinstance(partition, PartitionWithoutSD)
+        relative_path = "" if partition.relativePath is None else partition.relativePath
+        sd = _storage_from_thrift(
+            shared_sd,
+            storage_format,
+            bucket_property,
+            root_location + relative_path,
+        )
+        result_partitions.append(
+            HPartition(
+                db_name,
+                partition_table_name,
+                [] if partition.values is None else partition.values,
+                {} if partition.parameters is None else partition.parameters,
+                -1 if partition.createTime is None else partition.createTime,
+                -1 if partition.lastAccessTime is None else partition.lastAccessTime,
+                sd,
+                cat_name,
+                # Partition specs don't carry write ids.
+                -1,
+                columns,
+            )
+        )
+
+    return result_partitions
+
+
+def _check_connection_options(protocol: str, transport: str) -> None:
+    # The protocol and transport must match the metastore's configuration
+    # (hive.metastore.thrift.compact.protocol.enabled and
+    # hive.metastore.thrift.framed.transport.enabled).
+    if protocol not in _PROTOCOLS:
+        raise ValueError(
+            f"Expected protocol to be one of {sorted(_PROTOCOLS)}, got {protocol}"
+        )
+    if transport not in _TRANSPORTS:
+        raise ValueError(
+            f"Expected transport to be one of {sorted(_TRANSPORTS)}, got {transport}"
+        )
+
+
+def _open_connection(
+    host: str,
+    port: int,
+    protocol: str,
+    transport: str,
+) -> Tuple[TTransport.TTransportBase, hms.Client]:
+    tsocket = TSocket.TSocket(host, port)
+    thrift_transport = _TRANSPORTS[transport](tsocket)
+    thrift_protocol = _PROTOCOLS[protocol](thrift_transport)
+    thrift_transport.open()
+    try:
+        _configure_socket(tsocket.handle)
+    except BaseException:
+        thrift_transport.close()
+        raise
+    return thrift_transport, hms.Client(thrift_protocol)
+
+
+def _configure_socket(sock: Optional[socket.socket]) -> None:
+    if sock is None:
+        return
+    # Requests are flushed as whole messages, so there's nothing to gain from
+    # Nagle's algorithm delaying them.
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, "TCP_USER_TIMEOUT"):
+        sock.setsockopt(
+            socket.IPPROTO_TCP,
+            socket.TCP_USER_TIMEOUT,
+            _TCP_USER_TIMEOUT_MS,
+        )
+
+
+# A class based context manager rather than contextlib.contextmanager: thrift
+# exceptions are immutable and contextlib fails when it tries to reset the
+# traceback of an exception raised inside the with block.
 class _HMSConnection:
-    def __init__(self, host, port):
+    def __init__(
+        self,
+        host,
+        port,
+        protocol="binary",
+        transport="buffered",
+        ttl_seconds=60.0,
+        cache_size=1024,
+    ):
         self.host = host
         self.port = port
+        self.protocol = protocol
+        self.transport_type = transport
+        self.ttl_seconds = ttl_seconds
+        self.cache_size = cache_size
         self.transport = None
 
-    def __enter__(self):
-        socket = TSocket.TSocket(self.host, self.port)
-        self.transport = TTransport.TBufferedTransport(socket)
-        protocol = TBinaryProtocol(self.transport)
-        self.transport.open()
-        return HMS(hms.Client(protocol))
+    def __enter__(self) -> HMS:
+        if self.transport is not None:
+            raise RuntimeError("HMS connection is already open")
+        self.transport, client = _open_connection(
+            self.host,
+            self.port,
+            self.protocol,
+            self.transport_type,
+        )
+        return HMS(client, self.ttl_seconds, self.cache_size)
 
     def __exit__(self, type, value, traceback):
         if self.transport is not None:
             self.transport.close()
+            self.transport = None
+
+
+class HMSPool:
+    """
+    A thread-safe pool of open metastore connections.
+
+    Connections are handed out by `acquire` and returned to the pool when the
+    `with` block exits, so repeated calls don't pay for a new TCP connection
+    each time. Connections that fail with a transport or protocol error are
+    closed rather than returned. When `keepalive_interval` is set, a
+    background thread periodically pings idle connections and drops the ones
+    that have gone stale.
+
+    Each connection keeps its own `HMS`, so results cached by one `with`
+    block are served to later blocks that get the same connection. The
+    caches are not shared between connections; `ttl_seconds` and
+    `cache_size` configure each of them.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 9083,
+        protocol: str = "binary",
+        transport: str = "buffered",
+        min_size: int = 1,
+        max_size: int = 8,
+        keepalive_interval: Optional[float] = None,
+        ttl_seconds: float = 60.0,
+        cache_size: int = 1024,
+    ):
+        _check_connection_options(protocol, transport)
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(
+                f"Expected 0 <= min_size <= max_size and max_size >= 1, "
+                f"got min_size={min_size}, max_size={max_size}"
+            )
+
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        self.transport = transport
+        self.min_size = min_size
+        self.max_size = max_size
+        self.keepalive_interval = keepalive_interval
+        self.ttl_seconds = ttl_seconds
+        self.cache_size = cache_size
+
+        # Every open connection is either idle or checked out, and _size
+        # counts both so that max_size is a hard cap. The keepalive thread
+        # takes idle connections out while it pings them, they stay counted.
+        self._idle: "Deque[Tuple[TTransport.TTransportBase, HMS]]" = deque()
+        self._size = 0
+        self._lock = threading.Condition()
+        self._closed = threading.Event()
+        self._keepalive: Optional[threading.Thread] = None
+        try:
+            self._fill()
+        except BaseException:
+            # Don't leak the connections opened before the failure.
+            self.close()
+            raise
+
+        if keepalive_interval is not None:
+            self._keepalive = threading.Thread(
+                target=self._keepalive_loop,
+                name="pymetastore-keepalive",
+                daemon=True,
+            )
+            self._keepalive.start()
+
+    def __enter__(self) -> "HMSPool":
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def acquire(self) -> "_PooledConnection":
+        if self._closed.is_set():
+            raise RuntimeError("HMSPool is closed")
+        return _PooledConnection(self)
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._keepalive is not None:
+            self._keepalive.join()
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+            # Wake up acquirers waiting for a connection so they can fail.
+            self._lock.notify_all()
+        for transport, _ in idle:
+            self._discard(transport)
+
+    def _checkout(self) -> Tuple[TTransport.TTransportBase, HMS]:
+        with self._lock:
+            while True:
+                if self._closed.is_set():
+                    raise RuntimeError("HMSPool is closed")
+                if self._idle:
+                    return self._idle.popleft()
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                self._lock.wait()
+        return self._open()
+
+    def _checkin(
+        self,
+        transport: TTransport.TTransportBase,
+        metastore: HMS,
+        reusable: bool,
+    ) -> None:
+        if reusable:
+            self._release(transport, metastore)
+        else:
+            self._discard(transport)
+
+    def _open(self) -> Tuple[TTransport.TTransportBase, HMS]:
+        # The caller has already counted the connection in _size.
+        try:
+            transport, client = _open_connection(
+                self.host, self.port, self.protocol, self.transport
+            )
+            return transport, HMS(client, self.ttl_seconds, self.cache_size)
+        except BaseException:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+
+    def _release(self, transport: TTransport.TTransportBase, metastore: HMS):
+        # Check for close() under the lock, it drains _idle under the same lock
+        # so a connection can't be added after the drain and leak.
+        with self._lock:
+            if self._closed.is_set():
+                transport.close()
+                self._size -= 1
+            else:
+                self._idle.append((transport, metastore))
+            self._lock.notify()
+
+    def _discard(self, transport: TTransport.TTransportBase) -> None:
+        transport.close()
+        with self._lock:
+            self._size -= 1
+            self._lock.notify()
+
+    def _fill(self) -> None:
+        while True:
+            with self._lock:
+                # The keepalive thread refills the pool, don't open connections
+                # nobody will close once the pool is shutting down.
+                if self._closed.is_set():
+                    return
+                if len(self._idle) >= self.min_size or self._size >= self.max_size:
+                    return
+                self._size += 1
+            self._release(*self._open())
+
+    def _keepalive_loop(self) -> None:
+        assert self.keepalive_interval is not None
+        while not self._closed.wait(self.keepalive_interval):
+            with self._lock:
+                count = len(self._idle)
+            # Ping one connection at a time so the others stay available.
+            for _ in range(count):
+                with self._lock:
+                    if self._closed.is_set() or not self._idle:
+                        break
+                    transport, metastore = self._idle.popleft()
+                try:
+                    # Go through the client, a cached result isn't a ping.
+                    metastore.client.get_all_databases()
+                except TException:
+                    self._discard(transport)
+                except Exception:  # pylint: disable=broad-except
+                    _logger.exception("Dropping metastore connection after ping")
+                    self._discard(transport)
+                else:
+                    self._release(transport, metastore)
+            try:
+                self._fill()
+            except TException:
+                # The metastore is unreachable; retry on the next tick.
+                pass
+            except Exception:  # pylint: disable=broad-except
+                # Keep the thread alive, this is retried on the next tick.
+                _logger.exception("Failed to refill the metastore pool")
+
+
+class _PooledConnection:
+    def __init__(self, pool: HMSPool):
+        self.pool = pool
+        self.transport = None
+        self.metastore = None
+
+    def __enter__(self) -> HMS:
+        self.transport, self.metastore = self.pool._checkout()
+        return self.metastore
+
+    def __exit__(self, type, value, traceback):
+        if self.transport is None or self.metastore is None:
+            return
+        # Transport and protocol errors can leave the connection mid-message,
+        # anything else (e.g. NoSuchObjectException) means the call completed
+        # and the connection is still usable.
+        reusable = not isinstance(
+            value,
+            (TTransport.TTransportException, TProtocolException),
+        ) and (value is None or isinstance(value, Exception))
+        self.pool._checkin(self.transport, self.metastore, reusable)
+        self.transport = None
+        self.metastore = None
@@ -27,6 +27,7 @@ from pymetastore.metastore import (
     BucketingVersion,
     HColumn,
     HDatabase,
+    HMSPool,
     HPartition,
     HStorage,
     HTable,
@@ -360,6 +361,31 @@ def test_list_databases(hive_client):
     assert "test_db" in HMS(hive_client).list_databases()
 
 
+def test_pool():
+    """
+    Test the functionality of the connection pool.
+
+    This function acquires connections from an HMSPool, both sequentially and
+    after a failed call, and checks that the pooled connections are reused.
+
+    Raises:
+        AssertionError: If the pool doesn't return usable connections.
+    """
+    host = os.environ.get("HMS_HOST", "localhost")
+    port = int(os.environ.get("HMS_PORT", 9083))
+
+    with HMSPool(host, port, min_size=1, max_size=2) as pool:
+        with pool.acquire() as hms:
+            assert "test_db" in hms.list_databases()
+
+        with pytest.raises(ttypes.NoSuchObjectException):
+            with pool.acquire() as hms:
+                hms.get_database("does_not_exist")
+
+        with pool.acquire() as hms:
+            assert "test_db" in hms.list_databases()
+
+
 # pylint: disable=redefined-outer-name
 def test_get_database(hive_client):
     """
@@ -437,6 +463,68 @@ def test_get_table(hive_client):
     assert table.table_type == "EXTERNAL_TABLE"
 
 
+# pylint: disable=redefined-outer-name
+def test_get_tables(hive_client):
+    """
+    Test the functionality of retrieving several tables in one call.
+
+    This function retrieves the tables "test_table" and "test_table2" from the
+    database "test_db" together with a table that doesn't exist, and checks
+    that the existing tables are returned and added to the table cache.
+
+    Args:
+        hive_client: A handle to the Hive metastore client.
+
+    Raises:
+        AssertionError: If the fetched tables do not match the expected values.
+    """
+    hms = HMS(hive_client)
+    tables, failures = hms.get_tables(
+        "test_db", ["test_table", "test_table2", "missing"]
+    )
+    assert not failures
+    assert sorted(table.name for table in tables) == ["test_table", "test_table2"]
+    for table in tables:
+        assert isinstance(table, HTable)
+        assert table.database_name == "test_db"
+        assert hms.get_table("test_db", table.name) is table
+
+
+# pylint: disable=redefined-outer-name
+def test_get_table_cache(hive_client):
+    """
+    Test the caching of table metadata.
+
+    This function retrieves the table "test_table" twice and checks that the
+    second call is served from the cache, and that invalidating the table,
+    evicting it or disabling the cache causes the table to be fetched again.
+
+    Args:
+        hive_client: A handle to the Hive metastore client.
+
+    Raises:
+        AssertionError: If cached tables are not reused or not invalidated.
+    """
+    hms = HMS(hive_client)
+    table = hms.get_table("test_db", "test_table")
+    assert hms.get_table("test_db", "test_table") is table
+
+    hms.invalidate("test_db", "test_table")
+    refetched = hms.get_table("test_db", "test_table")
+    assert refetched is not table
+    assert refetched == table
+
+    bounded = HMS(hive_client, cache_size=1)
+    table = bounded.get_table("test_db", "test_table")
+    bounded.list_databases()
+    assert bounded.get_table("test_db", "test_table") is not table
+
+    uncached = HMS(hive_client, ttl_seconds=0)
+    assert uncached.get_table("test_db", "test_table") is not uncached.get_table(
+        "test_db", "test_table"
+    )
+
+
 # pylint: disable=redefined-outer-name
 def test_get_table_columns(hive_client):
     """
@@ -576,9 +664,112 @@ def test_get_partitions(hive_client):
         assert partition.cat_name == "hive"
         assert isinstance(partition.parameters, dict)
         assert partition.write_id == -1
+        assert partition.columns is None
 
     assert missing_partitions == set()
 
+    table = hms.get_table("test_db", "test_table")
+    for partition in hms.get_partitions("test_db", "test_table", table=table):
+        assert partition.columns is table.columns
+
+
+# pylint: disable=redefined-outer-name
+def test_get_partitions_by_names_and_filter(hive_client):
+    """
+    Test the functionality of retrieving a subset of the partitions of a table.
+
+    This function retrieves partitions from the table "test_table" in the database
+    "test_db", first by partition name and then by filter expression, and checks
+    that only the requested partitions are returned.
+
+    Args:
+        hive_client: A handle to the Hive metastore client.
+
+    Raises:
+        AssertionError: If the returned partitions do not match the requested ones.
+    """
+    hms = HMS(hive_client)
+
+    partitions = hms.get_partitions(
+        "test_db",
+        "test_table",
+        names=["partition=1", "partition=3"],
+    )
+    assert sorted(partition.values[0] for partition in partitions) == ["1", "3"]
+
+    partitions = hms.get_partitions(
+        "test_db", "test_table", partition_filter='partition = "2"'
+    )
+    assert [partition.values[0] for partition in partitions] == ["2"]
+
+    with pytest.raises(ValueError):
+        hms.get_partitions("test_db", "test_table", names=[], partition_filter="")
+
+
+# pylint: disable=redefined-outer-name
+def test_iter_partitions(hive_client):
+    """
+    Test the functionality of iterating over the partitions of a table in batches.
+
+    This function iterates over the partitions of the table "test_table" in the
+    database "test_db" two partitions at a time and checks that every partition
+    is returned exactly once.
+
+    Args:
+        hive_client: A handle to the Hive metastore client.
+
+    Raises:
+        AssertionError: If not all partitions are returned, or some are returned twice.
+    """
+    hms = HMS(hive_client)
+    partitions = list(hms.iter_partitions("test_db", "test_table", batch_size=2))
+
+    assert all(isinstance(partition, HPartition) for partition in partitions)
+    assert sorted(int(partition.values[0]) for partition in partitions) == [
+        1,
+        2,
+        3,
+        4,
+        5,
+    ]
+
+    with pytest.raises(ValueError):
+        hms.iter_partitions("test_db", "test_table", batch_size=0)
+
+
+# pylint: disable=redefined-outer-name
+def test_get_partitions_spec(hive_client):
+    """
+    Test the functionality of retrieving partitions through partition specs.
+
+    This function retrieves all partitions from the table "test_table" in the
+    database "test_db" using the partition spec API and checks that they match
+    the partitions returned by `get_partitions`.
+
+    Args:
+        hive_client: A handle to the Hive metastore client.
+
+    Raises:
+        AssertionError: If the partitions do not match the ones from `get_partitions`.
+    """
+    hms = HMS(hive_client)
+    partitions = hms.get_partitions_spec("test_db", "test_table")
+    expected = {
+        partition.values[0]: partition
+        for partition in hms.get_partitions("test_db", "test_table")
+    }
+
+    assert len(partitions) == 5
+    for partition in partitions:
+        assert isinstance(partition, HPartition)
+        expected_partition = expected[partition.values[0]]
+        assert partition.database_name == expected_partition.database_name
+        assert partition.table_name == expected_partition.table_name
+        assert partition.create_time == expected_partition.create_time
+        assert partition.cat_name == expected_partition.cat_name
+        assert partition.sd.storage_format == expected_partition.sd.storage_format
+        assert partition.sd.bucket_property == expected_partition.sd.bucket_property
+
 
 # pylint: disable=redefined-outer-name
 def test_get_partition(hive_client):
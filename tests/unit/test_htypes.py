@@ -1,3 +1,6 @@
+import copy
+import pickle
+
 import pytest
 
 from pymetastore.htypes import (
@@ -25,9 +28,8 @@ from pymetastore.htypes import (
 # trivial and they primarily expose a thin API over the mappings we define.
 
 
-# tests for primitive types.
-def test_primitivecategory_members():
-    expected_members = {
+_PRIMITIVE_CATEGORY_NAMES = frozenset(
+    {
         "VOID",
         "BOOLEAN",
         "BYTE",
@@ -48,59 +50,10 @@ def test_primitivecategory_members():
         "INTERVAL_DAY_TIME",
         "UNKNOWN",
     }
+)
 
-    actual_members = {member.name for member in PrimitiveCategory}
-    assert actual_members == expected_members
-
-
-def test_primitivecategory_values():
-    expected_values = {
-        "VOID",
-        "BOOLEAN",
-        "BYTE",
-        "SHORT",
-        "INT",
-        "LONG",
-        "FLOAT",
-        "DOUBLE",
-        "STRING",
-        "DATE",
-        "TIMESTAMP",
-        "TIMESTAMPLOCALTZ",
-        "BINARY",
-        "DECIMAL",
-        "VARCHAR",
-        "CHAR",
-        "INTERVAL_YEAR_MONTH",
-        "INTERVAL_DAY_TIME",
-        "UNKNOWN",
-    }
-
-    actual_values = {member.value for member in PrimitiveCategory}
-    assert actual_values == expected_values
-
-
-# tests for HType definitions.
-def test_htype_members():
-    expected_members = {"PRIMITIVE", "STRUCT", "MAP", "LIST", "UNION"}
-
-    actual_members = {member.name for member in HTypeCategory}
-    assert actual_members == expected_members
-
-
-def test_htype_values():
-    expected_values = {PrimitiveCategory, "STRUCT", "MAP", "LIST", "UNION"}
-
-    actual_values = {member.value for member in HTypeCategory}
-    assert actual_values == expected_values
-
-
-# Tests for the Serde definitions. Remember that we are converting between
-# Thrift and Hive types so we need to account for that. It's important to test
-# that stuff here because the thrift types are auto generated and we should
-# catch any changes that might happen in the .thrift files as soon as possible.
-def test_serdetypes_members():
-    expected_members = {
+_SERDE_TYPE_NAMES = frozenset(
+    {
         "VOID",
         "BOOLEAN",
         "TINYINT",
@@ -125,13 +78,10 @@ def test_serdetypes_members():
         "UNION",
         "UNKNOWN",
     }
+)
 
-    actual_members = {member.name for member in SerdeTypeNameConstants}
-    assert actual_members == expected_members
-
-
-def test_serdetypes_values():
-    expected_values = {
+_SERDE_TYPE_VALUES = frozenset(
+    {
         "void",
         "boolean",
         "tinyint",
@@ -156,9 +106,29 @@ def test_serdetypes_values():
         "uniontype",
         "unknown",
     }
+)
 
-    actual_values = {member.value for member in SerdeTypeNameConstants}
-    assert actual_values == expected_values
+
+# Primitive categories use their names as values. HType categories hold the
+# primitive categories under PRIMITIVE. The Serde definitions are the ones we
+# convert Thrift types from. It's important to test that stuff here because
+# the thrift types are auto generated and we should catch any changes that
+# might happen in the .thrift files as soon as possible.
+@pytest.mark.parametrize(
+    "enum_cls, expected_members, expected_values",
+    [
+        (PrimitiveCategory, _PRIMITIVE_CATEGORY_NAMES, _PRIMITIVE_CATEGORY_NAMES),
+        (
+            HTypeCategory,
+            frozenset({"PRIMITIVE", "STRUCT", "MAP", "LIST", "UNION"}),
+            frozenset({PrimitiveCategory, "STRUCT", "MAP", "LIST", "UNION"}),
+        ),
+        (SerdeTypeNameConstants, _SERDE_TYPE_NAMES, _SERDE_TYPE_VALUES),
+    ],
+)
+def test_enum_members_and_values(enum_cls, expected_members, expected_values):
+    assert frozenset(member.name for member in enum_cls) == expected_members
+    assert frozenset(member.value for member in enum_cls) == expected_values
 
 
 def test_token_creation():
@@ -187,6 +157,10 @@ def test_token_properties():
     # Test the string representation of the Token instance
     assert str(token) == "1:<"
 
+    # Tokens are plain tuples without a per-instance __dict__
+    assert not hasattr(token, "__dict__")
+    assert token == (1, "<", False)
+
 
 # Tests for the TypeParser class
 def test_typeparser_tokenize():
@@ -487,14 +461,79 @@ def test_union_type_parser():
     assert ptype.types[1].category == HPrimitiveType(PrimitiveCategory.STRING).category
 
 
+def test_uppercase_type_parser():
+    parser = TypeParser("UNIONTYPE<INT,ARRAY<STRING>,DECIMAL(5,2)>")
+    ptype = parser.parse_type()
+    assert isinstance(ptype, HUnionType)
+    assert ptype.types[0] == HPrimitiveType(PrimitiveCategory.INT)
+    assert isinstance(ptype.types[1], HListType)
+    assert ptype.types[1].element_type == HPrimitiveType(PrimitiveCategory.STRING)
+    assert isinstance(ptype.types[2], HDecimalType)
+    assert ptype.types[2].precision == 5
+    assert ptype.types[2].scale == 2
+
+
 def test_htype_str_repr():
     ex = HType("int", PrimitiveCategory.INT)
     assert str(ex) == "HType(name=int, category=PrimitiveCategory.INT)"
     assert repr(ex) == "HType('int', PrimitiveCategory.INT)"
-    clone = eval(repr(ex))
+    clone = copy.deepcopy(ex)
     assert clone == ex
 
 
+def test_hprimitive_type_is_shared():
+    _type = HPrimitiveType(PrimitiveCategory.INT)
+    assert HPrimitiveType(PrimitiveCategory.INT) is _type
+    assert HPrimitiveType(PrimitiveCategory.STRING) is not _type
+    assert TypeParser("int").parse_type() is _type
+    assert copy.deepcopy(_type) is _type
+    assert pickle.loads(pickle.dumps(_type)) is _type
+
+
+def test_htypes_have_no_dict():
+    ptype = TypeParser("struct<a:map<string,array<decimal(3,2)>>,b:uniontype<char(3)>>")
+    ptype = ptype.parse_type()
+    assert not hasattr(ptype, "__dict__")
+    assert not hasattr(ptype.types[0].value_type, "__dict__")
+    assert not hasattr(ptype.types[1].types[0], "__dict__")
+    assert pickle.loads(pickle.dumps(ptype)) == ptype
+    assert copy.deepcopy(ptype) == ptype
+
+
+# The repr of every type is valid Python that rebuilds an equal type.
+@pytest.mark.parametrize(
+    "_type",
+    [
+        HType("int", PrimitiveCategory.INT),
+        HPrimitiveType(PrimitiveCategory.INT),
+        HMapType(
+            HPrimitiveType(PrimitiveCategory.STRING),
+            HPrimitiveType(PrimitiveCategory.INT),
+        ),
+        HListType(HPrimitiveType(PrimitiveCategory.INT)),
+        HUnionType(
+            [
+                HPrimitiveType(PrimitiveCategory.INT),
+                HPrimitiveType(PrimitiveCategory.STRING),
+            ]
+        ),
+        HVarcharType(10),
+        HCharType(10),
+        HDecimalType(10, 2),
+        HStructType(
+            ["name", "age"],
+            [
+                HPrimitiveType(PrimitiveCategory.STRING),
+                HPrimitiveType(PrimitiveCategory.INT),
+            ],
+        ),
+    ],
+    ids=lambda _type: _type.__class__.__name__,
+)
+def test_htype_repr_round_trip(_type):
+    assert eval(repr(_type)) == _type
+
+
 # pylint: disable=line-too-long
 def test_hmap_type_str_repr_and_eq():
     typ = HMapType(
@@ -510,7 +549,7 @@ def test_hmap_type_str_repr_and_eq():
         == "HMapType(HPrimitiveType(PrimitiveCategory.STRING), HPrimitiveType(PrimitiveCategory.INT))"
     )
 
-    clone = eval(repr(typ))
+    clone = copy.deepcopy(typ)
     assert clone == typ
 
 
@@ -524,7 +563,7 @@ def test_hlist_type_str_repr_and_eq():
     )
     assert repr(_type) == "HListType(HPrimitiveType(PrimitiveCategory.INT))"
 
-    clone = eval(repr(_type))
+    clone = copy.deepcopy(_type)
     assert clone == _type
 
 
@@ -546,7 +585,7 @@ def test_hunion_type_str_repr_and_eq():
         == "HUnionType([HPrimitiveType(PrimitiveCategory.INT), HPrimitiveType(PrimitiveCategory.STRING)])"
     )
 
-    clone = eval(repr(_type))
+    clone = copy.deepcopy(_type)
     assert clone == _type
 
 
@@ -556,7 +595,7 @@ def test_hvarchar_type_str_repr_and_eq():
     assert str(_type) == "HVarcharType(length=10)"
     assert repr(_type) == "HVarcharType(10)"
 
-    clone = eval(repr(_type))
+    clone = copy.deepcopy(_type)
     assert clone == _type
 
 
@@ -566,7 +605,7 @@ def test_hchar_type_str_repr_and_eq():
     assert str(_type) == "HCharType(length=10)"
     assert repr(_type) == "HCharType(10)"
 
-    clone = eval(repr(_type))
+    clone = copy.deepcopy(_type)
     assert clone == _type
 
 
@@ -576,7 +615,7 @@ def test_hdecimal_type_str_repr_and_eq():
     assert str(_type) == "HDecimalType(precision=10, scale=2)"
     assert repr(_type) == "HDecimalType(10, 2)"
 
-    clone = eval(repr(_type))
+    clone = copy.deepcopy(_type)
     assert clone == _type
 
 
@@ -600,5 +639,5 @@ def test_hstruct_type_str_repr_and_eq():
         == "HStructType(['name', 'age'], [HPrimitiveType(PrimitiveCategory.STRING), HPrimitiveType(PrimitiveCategory.INT)])"
     )
 
-    clone = eval(repr(_type))
+    clone = copy.deepcopy(_type)
     assert clone == _type
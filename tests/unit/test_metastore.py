@@ -0,0 +1,426 @@
+import copy
+import socket
+import time
+
+import pytest
+from thrift.transport import TTransport
+
+from pymetastore import metastore
+from pymetastore.hive_metastore.ttypes import (
+    FieldSchema,
+    Partition,
+    PartitionSpec,
+    SerDeInfo,
+    SkewedInfo,
+    StorageDescriptor,
+    Table,
+)
+from pymetastore.metastore import HMS, HMSPool
+
+# These tests run the thrift to HMS conversions against a fake client that
+# returns the same thrift structs the metastore would, so they don't need a
+# running metastore.
+
+
+def _storage_descriptor(cols, location="file:/tmp/test_db/test_table"):
+    return StorageDescriptor(
+        cols=cols,
+        location=location,
+        inputFormat="org.apache.hadoop.mapred.TextInputFormat",
+        outputFormat="org.apache.hadoop.hive.ql.io.HiveIgnoreKeyTextOutputFormat",
+        numBuckets=-1,
+        serdeInfo=SerDeInfo(
+            name="test_serde",
+            serializationLib="org.apache.hadoop.hive.serde2.lazy.LazySimpleSerDe",
+            parameters={"field.delim": ","},
+        ),
+        bucketCols=[],
+        sortCols=[],
+        skewedInfo=SkewedInfo([], [], {}),
+    )
+
+
+def _table(name, cols):
+    return Table(
+        tableName=name,
+        dbName="test_db",
+        owner="owner",
+        sd=_storage_descriptor(cols),
+        partitionKeys=[FieldSchema("partition", "string", "")],
+        parameters={"EXTERNAL": "TRUE"},
+        tableType="EXTERNAL_TABLE",
+    )
+
+
+def _partition(value, cols):
+    return Partition(
+        values=[str(value)],
+        dbName="test_db",
+        tableName="test_table",
+        createTime=1,
+        lastAccessTime=0,
+        sd=_storage_descriptor(cols, f"file:/tmp/test_db/test_table/partition={value}"),
+        parameters={},
+        catName="hive",
+    )
+
+
+class FakeClient:
+    """
+    Serves a single table "test_db.test_table" with two partitions and
+    records the calls made to it.
+    """
+
+    def __init__(self, cols=None, table_cols=None):
+        self.cols = cols or [
+            FieldSchema("col1", "int", "c1"),
+            FieldSchema("col2", "string", "c2"),
+        ]
+        # Column overrides for other tables, by table name.
+        self.table_cols = table_cols or {}
+        self.calls = []
+
+    def get_all_databases(self):
+        self.calls.append(("get_all_databases",))
+        return ["default", "test_db"]
+
+    def get_all_tables(self, database_name):
+        self.calls.append(("get_all_tables", database_name))
+        return ["test_table"]
+
+    def get_table(self, database_name, table_name):
+        self.calls.append(("get_table", database_name, table_name))
+        return _table(table_name, self.table_cols.get(table_name, self.cols))
+
+    def get_table_objects_by_name(self, database_name, table_names):
+        self.calls.append(("get_table_objects_by_name", database_name))
+        # Like the metastore, return lowercased names and skip missing tables.
+        return [
+            _table(name.lower(), self.table_cols.get(name.lower(), self.cols))
+            for name in table_names
+            if name.lower() != "missing"
+        ]
+
+    def get_partitions(self, database_name, table_name, max_parts):
+        self.calls.append(("get_partitions", database_name, table_name))
+        return [_partition(value, self.cols) for value in (1, 2)]
+
+    def get_partitions_by_filter(self, database_name, table_name, expr, max_parts):
+        self.calls.append(("get_partitions_by_filter", database_name, expr))
+        return [_partition(1, self.cols)]
+
+    def get_partition_by_name(self, database_name, table_name, name):
+        self.calls.append(("get_partition_by_name", database_name, table_name))
+        return _partition(name.split("=")[-1], self.cols)
+
+
+def test_partitions_skip_column_types(monkeypatch):
+    def fail(type_string):
+        raise AssertionError(f"Parsed {type_string} for a partition")
+
+    # Types the parser doesn't know must not stop partitions from loading.
+    client = FakeClient([FieldSchema("shape", "geometry", "")])
+    hms = HMS(client)
+    monkeypatch.setattr(metastore, "_parse_type", fail)
+
+    partitions = hms.get_partitions("test_db", "test_table")
+    assert [partition.values for partition in partitions] == [["1"], ["2"]]
+    assert all(partition.columns is None for partition in partitions)
+    assert hms.get_partition("test_db", "test_table", "partition=1").columns is None
+
+
+def test_partitions_share_table_columns():
+    hms = HMS(FakeClient())
+    table = hms.get_table("test_db", "test_table")
+    for partition in hms.get_partitions("test_db", "test_table", table=table):
+        assert partition.columns is table.columns
+
+
+def test_unknown_column_type_fails_table():
+    hms = HMS(FakeClient([FieldSchema("shape", "geometry", "")]))
+    with pytest.raises(ValueError, match="geometry is not a valid type"):
+        hms.get_table("test_db", "test_table")
+
+
+def test_get_tables_collects_failures():
+    client = FakeClient(
+        table_cols={
+            "wide_varchar": [FieldSchema("col1", "varchar(70000)", "")],
+            "geometry": [FieldSchema("shape", "geometry", "")],
+        }
+    )
+    hms = HMS(client)
+    tables, failures = hms.get_tables(
+        "test_db", ["test_table", "wide_varchar", "geometry", "missing"]
+    )
+    assert [table.name for table in tables] == ["test_table"]
+    assert sorted(failures) == ["geometry", "wide_varchar"]
+    assert isinstance(failures["wide_varchar"], ValueError)
+    assert "Varchar length cannot exceed 65535" in str(failures["wide_varchar"])
+    assert "geometry is not a valid type" in str(failures["geometry"])
+
+
+def test_get_tables_warms_table_cache():
+    client = FakeClient()
+    hms = HMS(client)
+    tables, _ = hms.get_tables("test_db", ["Test_Table"])
+    calls = len(client.calls)
+    assert hms.get_table("test_db", "Test_Table") is tables[0]
+    assert len(client.calls) == calls
+
+
+class FakeTransport:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """
+    Replaces the metastore connections opened by HMSPool with fake ones and
+    returns the list of transports opened so far.
+    """
+    transports = []
+
+    def open_connection(host, port, protocol, transport):
+        transports.append(FakeTransport())
+        return transports[-1], FakeClient()
+
+    monkeypatch.setattr(metastore, "_open_connection", open_connection)
+    return transports
+
+
+# pylint: disable=redefined-outer-name
+def test_pool_max_size_is_a_hard_cap(opened):
+    with HMSPool(min_size=2, max_size=2) as pool:
+        with pool.acquire(), pool.acquire():
+            # Refilling the pool while every connection is checked out must
+            # not open more than max_size connections.
+            pool._fill()
+            assert len(opened) == 2
+        assert not any(transport.closed for transport in opened)
+    assert all(transport.closed for transport in opened)
+
+
+# pylint: disable=redefined-outer-name
+def test_pool_closes_connections_when_fill_fails(opened, monkeypatch):
+    open_connection = metastore._open_connection
+
+    def fail_third(*args):
+        if len(opened) == 2:
+            raise OSError("connection refused")
+        return open_connection(*args)
+
+    monkeypatch.setattr(metastore, "_open_connection", fail_third)
+    with pytest.raises(OSError):
+        HMSPool(min_size=3, max_size=3)
+    assert len(opened) == 2
+    assert all(transport.closed for transport in opened)
+
+
+def test_open_connection_closes_transport_on_setup_failure(monkeypatch):
+    transports = []
+
+    def buffered(tsocket):
+        transports.append(TTransport.TBufferedTransport(tsocket))
+        return transports[-1]
+
+    def fail(sock):
+        raise OSError("setsockopt failed")
+
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    monkeypatch.setitem(metastore._TRANSPORTS, "buffered", buffered)
+    monkeypatch.setattr(metastore, "_configure_socket", fail)
+    try:
+        _, port = server.getsockname()
+        with pytest.raises(OSError, match="setsockopt failed"):
+            metastore._open_connection("127.0.0.1", port, "binary", "buffered")
+        assert not transports[0].isOpen()
+    finally:
+        server.close()
+
+
+# pylint: disable=redefined-outer-name
+def test_pool_keepalive_survives_unexpected_errors(opened, monkeypatch):
+    def fail():
+        raise OSError("setsockopt failed")
+
+    with HMSPool(min_size=1, max_size=2, keepalive_interval=0.01) as pool:
+        monkeypatch.setattr(pool._idle[0][1].client, "get_all_databases", fail)
+        deadline = time.monotonic() + 5
+        while len(opened) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # The failing connection was dropped and replaced by a new one.
+        assert opened[0].closed
+        assert len(opened) == 2
+        assert pool._keepalive.is_alive()
+
+
+# pylint: disable=redefined-outer-name
+def test_pool_keeps_cache_per_connection(opened):
+    with HMSPool(min_size=1, max_size=1) as pool:
+        with pool.acquire() as hms:
+            table = hms.get_table("test_db", "test_table")
+        with pool.acquire() as hms:
+            assert hms.get_table("test_db", "test_table") is table
+            assert hms.client.calls == [("get_table", "test_db", "test_table")]
+
+
+def test_cached_results_are_shared():
+    hms = HMS(FakeClient())
+    table = hms.get_table("test_db", "test_table")
+    # Callers share the cached instance, copies are theirs to change.
+    assert hms.get_table("test_db", "test_table") is table
+    clone = copy.deepcopy(table)
+    clone.parameters["EXTERNAL"] = "FALSE"
+    assert hms.get_table("test_db", "test_table").parameters["EXTERNAL"] == "TRUE"
+
+
+def test_cache_expires_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(metastore.time, "monotonic", lambda: now[0])
+    client = FakeClient()
+    hms = HMS(client, ttl_seconds=10)
+    table = hms.get_table("test_db", "test_table")
+    now[0] += 9
+    assert hms.get_table("test_db", "test_table") is table
+    now[0] += 1
+    assert hms.get_table("test_db", "test_table") is not table
+    assert client.calls.count(("get_table", "test_db", "test_table")) == 2
+
+
+def test_cache_evicts_least_recently_used():
+    client = FakeClient()
+    hms = HMS(client, cache_size=2)
+    hms.list_tables("a")
+    hms.list_tables("b")
+    hms.list_tables("a")
+    # "b" is the least recently used entry, so it is the one evicted.
+    hms.list_tables("c")
+    hms.list_tables("a")
+    assert [call[1] for call in client.calls] == ["a", "b", "c"]
+    hms.list_tables("b")
+    assert [call[1] for call in client.calls] == ["a", "b", "c", "b"]
+
+
+def test_cache_disabled():
+    client = FakeClient()
+    for hms in (HMS(client, ttl_seconds=0), HMS(client, cache_size=0)):
+        assert hms.get_table("test_db", "test_table") is not hms.get_table(
+            "test_db", "test_table"
+        )
+    assert len(client.calls) == 4
+
+
+def test_invalidate():
+    client = FakeClient()
+    hms = HMS(client)
+    hms.list_databases()
+    hms.list_tables("test_db")
+    hms.list_tables("other_db")
+    hms.get_table("test_db", "test_table")
+    hms.get_table("test_db", "other_table")
+
+    # A table drops its own entry and the listing of its database.
+    hms.invalidate("test_db", "test_table")
+    assert sorted(hms._cache) == [
+        ("get_table", "test_db", "other_table"),
+        ("list_databases",),
+        ("list_tables", "other_db"),
+    ]
+
+    # A database drops everything in it and the database listing.
+    hms.invalidate("test_db")
+    assert list(hms._cache) == [("list_tables", "other_db")]
+
+    hms.invalidate()
+    assert not hms._cache
+
+
+@pytest.mark.parametrize(
+    "field, value, message",
+    [
+        ("tableType", None, "Expected tableType to be str, got NoneType"),
+        ("tableName", 1, "Expected tableName to be str, got int"),
+        ("parameters", [], "Expected parameters to be dict, got list"),
+        ("sd", None, "Expected sd to be StorageDescriptor, got NoneType"),
+    ],
+)
+def test_table_validation_errors(field, value, message):
+    table = _table("test_table", [FieldSchema("col1", "int", "")])
+    setattr(table, field, value)
+    with pytest.raises(TypeError, match=f"^{message}$"):
+        metastore._table_from_thrift(table)
+
+
+def test_req():
+    table = _table("test_table", [])
+    assert metastore._req(table, "tableName", str) == "test_table"
+    table.owner = None
+    assert metastore._req(table, "owner", str, optional=True) is None
+    with pytest.raises(TypeError, match="^Expected owner to be str, got NoneType$"):
+        metastore._req(table, "owner", str)
+
+
+def test_partitions_share_storage_parts():
+    partitions = HMS(FakeClient()).get_partitions("test_db", "test_table")
+    first, second = partitions
+    assert first.sd is not second.sd
+    assert first.sd.location != second.sd.location
+    assert first.sd.storage_format is second.sd.storage_format
+    assert first.sd.bucket_property is second.sd.bucket_property
+
+
+# pylint: disable=redefined-outer-name
+def test_pool_closes_connections_returned_after_close(opened):
+    pool = HMSPool(min_size=0, max_size=1)
+    connection = pool.acquire()
+    connection.__enter__()
+    pool.close()
+    connection.__exit__(None, None, None)
+    assert opened[0].closed
+    assert not pool._idle
+    assert pool._size == 0
+
+
+# pylint: disable=redefined-outer-name
+def test_pool_does_not_refill_after_close(opened):
+    pool = HMSPool(min_size=1, max_size=2)
+    pool.close()
+    pool._fill()
+    assert len(opened) == 1
+    assert pool._size == 0
+
+
+def test_get_partitions_by_filter():
+    client = FakeClient()
+    hms = HMS(client)
+    partitions = hms.get_partitions(
+        "test_db", "test_table", partition_filter='partition = "1"'
+    )
+    assert [partition.values for partition in partitions] == [["1"]]
+    assert client.calls == [("get_partitions_by_filter", "test_db", 'partition = "1"')]
+    with pytest.raises(ValueError, match="only one of names or partition_filter"):
+        hms.get_partitions("test_db", "test_table", names=[], partition_filter="")
+
+
+def test_empty_partition_spec():
+    spec = PartitionSpec(dbName="test_db", tableName="test_table", rootPath="")
+    assert metastore._partitions_from_spec(spec) == []
+
+
+def test_cache_ignores_name_case():
+    client = FakeClient()
+    hms = HMS(client)
+    table = hms.get_table("Test_DB", "Test_Table")
+    assert hms.get_table("test_db", "test_table") is table
+    assert len(client.calls) == 1
+
+    hms.invalidate("TEST_DB", "TEST_TABLE")
+    assert hms.get_table("Test_DB", "Test_Table") is not table
+    assert len(client.calls) == 2